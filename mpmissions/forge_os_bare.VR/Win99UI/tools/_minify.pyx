@@ -0,0 +1,86 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled single-pass CSS minifier used by package_css.py when available.
+
+This is a character-level state machine equivalent to the regex-based
+minify_css in package_css.py. A "gap" is any run of whitespace and/or
+complete /* ... */ comments; gaps collapse to a single space, or vanish
+entirely next to an operator ({};,:), and a semicolon directly before a
+closing brace is dropped.
+
+Build:
+    python -m pip install cython
+    cythonize -i _minify.pyx
+"""
+
+
+cdef inline bint _is_op(Py_UCS4 c):
+    return c == u'{' or c == u'}' or c == u';' or c == u',' or c == u':'
+
+
+cdef Py_ssize_t _skip_gap(str css, Py_ssize_t i, Py_ssize_t n, bint* has_ws):
+    """Returns the index just past the gap starting at i (i if there is none)."""
+    cdef Py_ssize_t end
+    cdef Py_UCS4 c
+    has_ws[0] = False
+    while i < n:
+        c = css[i]
+        if c.isspace():
+            has_ws[0] = True
+            i += 1
+        elif c == u'/' and i + 1 < n and css[i + 1] == u'*':
+            end = css.find(u"*/", i + 2)
+            if end < 0:
+                # Unterminated comments are left untouched
+                break
+            i = end + 2
+        else:
+            break
+    return i
+
+
+def minify_css(str css):
+    """Minifies CSS content by removing unnecessary characters.
+
+    Args:
+        css (str): Original CSS content
+
+    Returns:
+        str: Minified CSS content
+    """
+    cdef Py_ssize_t n = len(css)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t j
+    cdef Py_ssize_t start = 0
+    cdef bint has_ws = False
+    cdef Py_UCS4 c
+    cdef list pieces = []
+
+    # Literal characters are copied as whole slices css[start:i]
+    while i < n:
+        j = _skip_gap(css, i, n, &has_ws)
+        if j > i:
+            if i > start:
+                pieces.append(css[start:i])
+            if has_ws and not (j < n and _is_op(css[j])):
+                pieces.append(u" ")
+            i = start = j
+            continue
+
+        c = css[i]
+        if _is_op(c):
+            j = _skip_gap(css, i + 1, n, &has_ws)
+            if c == u';' and j < n and css[j] == u'}':
+                if i > start:
+                    pieces.append(css[start:i])
+                start = j
+            elif j > i + 1:
+                pieces.append(css[start:i + 1])
+                start = j
+            i = j
+            continue
+
+        i += 1
+
+    if start < n:
+        pieces.append(css[start:n])
+    return u"".join(pieces).strip()
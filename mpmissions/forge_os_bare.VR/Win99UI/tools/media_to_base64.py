@@ -14,9 +14,14 @@ Directory Input Behavior:
     - "." (current directory): Processes media files in the current directory only (one layer)
     - ".." (recursive): Processes media files in current directory and all subdirectories recursively
     - Any specific path: Processes media files recursively from that path
+    - Files whose '.b64' output is already up to date are skipped
 
 Functions:
     convert_to_base64(input_file): Converts a media file to base64 encoded text
+    is_up_to_date(input_file): Checks if a file's '.b64' output can be reused
+    find_media_files(root, recursive): Finds supported media files in a directory
+    process_path(dir_path, recursive, jobs, force): Converts a file or directory
+    parse_args(): Parses command-line arguments
     main(): Handles user input and initiates file processing
 
 Usage:
@@ -27,15 +32,37 @@ Usage:
         - Current directory (non-recursive): "."
         - Current directory (recursive): ".."
         - Specific directory: "path/to/media/folder"
+    
+    Alternatively pass the options on the command line to run without prompts:
+        python media_to_base64.py assets --recursive --jobs 4
 
 Output:
     Creates new files with '.b64' extension: 'your_file.webm.b64'
 """
 
-import base64
+import argparse
+import mmap
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# pylint: disable=import-error
+try:
+    # SIMD-accelerated drop-in replacement for the stdlib module
+    import pybase64 as base64  # type: ignore
+except ImportError:
+    import base64
+
+# Supported extensions; a tuple so file names can be tested with a single
+# str.endswith call
+SUPPORTED_EXTENSIONS = ('.jpg', '.jpeg', '.mp3', '.mp4', '.md', '.png', '.webm')
+
+# Input window encoded per step; a multiple of 3 so every window encodes to
+# complete base64 quads and the pieces concatenate without padding
+ENCODE_CHUNK_SIZE = 3 * (1 << 20)
+
+
 def convert_to_base64(input_file):
     """Converts a media file to base64-encoded text.
     
@@ -47,74 +74,191 @@ def convert_to_base64(input_file):
     Args:
         input_file (Path): Path object pointing to the media file
         
+    Returns:
+        Path: Path of the written '.b64' file
+        
     Output:
         Creates a file with original extension + '.b64' (e.g., 'video.mp4.b64')
     """
-    # Read file in binary mode
-    with open(input_file, 'rb') as file:
-        # Convert to base64
-        encoded = base64.b64encode(file.read())
-        
+    # Source mtime as of the read below, used to stamp the output
+    source_stat = os.stat(input_file)
+    
     # Create output filename by appending .b64 while keeping original extension
     output_file = input_file.with_suffix(input_file.suffix + '.b64')
     
-    # Write base64 string to text file
-    with open(output_file, 'w') as file:
-        file.write(encoded.decode('utf-8'))
+    # Memory-map the input and encode it window by window, so even very large
+    # videos never sit fully in memory. Base64 is plain ASCII, so the encoded
+    # bytes are written as-is (no decode or newline translation needed)
+    with open(input_file, 'rb') as src, open(output_file, 'wb') as dst:
+        # mmap refuses zero-length files; their encoding is empty anyway
+        if os.fstat(src.fileno()).st_size:
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                for offset in range(0, len(view), ENCODE_CHUNK_SIZE):
+                    dst.write(
+                        base64.b64encode(view[offset:offset + ENCODE_CHUNK_SIZE])
+                    )
+    stamp_output(source_stat, output_file)
         
-    print(f"Converted {input_file} to base64 -> {output_file}")
+    return output_file
 
-def main():
-    """Main function to handle user input and process media files.
+def stamp_output(source_stat, output_file):
+    """Copies the source file's modification time onto its output.
+    
+    The matching timestamp marks the output as generated from that exact
+    revision of the source, see is_up_to_date().
     
-    Prompts user for path and processes supported media files to base64.
-    Handles both single files and directories (recursive or non-recursive).
+    Args:
+        source_stat (os.stat_result): Stat of the media file taken before reading it
+        output_file (Path): Path object pointing to the generated '.b64' file
     """
-    # Get directory path from user
-    dir_path = input("Enter the path to your media file or folder: ").strip()
+    os.utime(output_file, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+
+def is_up_to_date(input_file):
+    """Checks whether a media file's '.b64' output matches the current source.
     
-    # Determine if recursive based on ".." input
-    # ".." means recursive (all subdirectories)
-    # "." means single directory layer only
-    recursive = dir_path == ".."
+    Args:
+        input_file (Path): Path object pointing to the media file
+        
+    Returns:
+        bool: True if the existing '.b64' file can be reused as-is
+    """
+    output_file = input_file.with_suffix(input_file.suffix + '.b64')
+    try:
+        output_mtime = os.stat(output_file).st_mtime_ns
+    except FileNotFoundError:
+        return False
+    return output_mtime == os.stat(input_file).st_mtime_ns
+
+def find_media_files(root, recursive):
+    """Yields all supported media files in a directory.
     
-    # If user enters ".." or ".", use current directory
-    # ".." triggers recursive mode, "." triggers non-recursive mode
-    # Both operate within the current working directory, NOT the parent
-    if dir_path == ".." or dir_path == ".":
-        dir_path = "."
+    Walks the tree with os.scandir so the cached directory entry metadata is
+    used, and only builds Path objects for matching files.
     
+    Args:
+        root (Path): Directory to search
+        recursive (bool): If True, descend into subdirectories
+        
+    Yields:
+        Path: Path object for each supported media file found
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    yield from find_media_files(entry.path, recursive)
+            elif (
+                entry.name.lower().endswith(SUPPORTED_EXTENSIONS)
+                and entry.is_file()
+            ):
+                yield Path(entry.path)
+
+def process_path(dir_path, recursive=False, jobs=None, force=False):
+    """Converts a single media file or all supported files in a directory.
+    
+    Args:
+        dir_path (str): Path to a media file or directory
+        recursive (bool): If True, process subdirectories recursively
+        jobs (int): Number of worker threads, or None for the executor default
+        force (bool): If True, also rebuild files whose output is up to date
+    """
     path = Path(dir_path)
     
     if not path.exists():
         print("Invalid path provided")
         return
     
-    # Supported extensions
-    supported_extensions = {'.jpg', '.jpeg', '.mp3', '.mp4', '.md', '.png', '.webm'}
-    
     # Process single file
     if path.is_file():
-        if path.suffix.lower() in supported_extensions:
-            convert_to_base64(path)
+        if path.name.lower().endswith(SUPPORTED_EXTENSIONS):
+            output_file = convert_to_base64(path)
+            print(f"Converted {path} to base64 -> {output_file}")
         else:
             print(f"Unsupported file type: {path.suffix}")
         return
     
     # Process directory - recursive or non-recursive based on input
-    if recursive:
-        files = path.rglob('*')
-    else:
-        files = path.glob('*')
-    
-    processed_count = 0
-    for file in files:
-        if file.is_file() and file.suffix.lower() in supported_extensions:
-            convert_to_base64(file)
-            processed_count += 1
-    
-    if processed_count == 0:
+    media_files = list(find_media_files(path, recursive))
+    
+    # Skip files whose output is already current
+    stale_files = [
+        file for file in media_files if force or not is_up_to_date(file)
+    ]
+    if len(stale_files) < len(media_files):
+        print(f"Skipped {len(media_files) - len(stale_files)} unchanged file(s)")
+    
+    # Each file is encoded independently, so spread them across threads
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for file, output_file in zip(
+            stale_files, executor.map(convert_to_base64, stale_files)
+        ):
+            print(f"Converted {file} to base64 -> {output_file}")
+    
+    if not media_files:
         print(f"No supported media files found in {path}")
 
+def parse_args():
+    """Parses command-line arguments for headless runs.
+    
+    Returns:
+        argparse.Namespace: Parsed arguments (path, recursive, jobs, force)
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert media files to base64 encoded '.b64' files."
+    )
+    parser.add_argument('path', help="media file or directory to process")
+    parser.add_argument(
+        '-r', '--recursive',
+        action='store_true',
+        help="process subdirectories recursively",
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help="number of worker threads (default: automatic)",
+    )
+    parser.add_argument(
+        '-f', '--force',
+        action='store_true',
+        help="rebuild files even if their '.b64' output is up to date",
+    )
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+def main():
+    """Main function to handle user input and process media files.
+    
+    Takes the path and options from the command line when given, otherwise
+    prompts the user for a path. Handles both single files and directories
+    (recursive or non-recursive).
+    """
+    if len(sys.argv) > 1:
+        # Headless mode: everything comes from the command line
+        args = parse_args()
+        process_path(
+            args.path, recursive=args.recursive, jobs=args.jobs, force=args.force
+        )
+        return
+    
+    # Get directory path from user
+    dir_path = input("Enter the path to your media file or folder: ").strip()
+    
+    # Determine if recursive based on ".." input
+    # ".." means recursive (all subdirectories)
+    # "." means single directory layer only
+    recursive = dir_path == ".."
+    
+    # If user enters ".." or ".", use current directory
+    # ".." triggers recursive mode, "." triggers non-recursive mode
+    # Both operate within the current working directory, NOT the parent
+    if dir_path == ".." or dir_path == ".":
+        dir_path = "."
+    
+    process_path(dir_path, recursive=recursive)
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
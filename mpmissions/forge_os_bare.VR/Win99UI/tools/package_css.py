@@ -11,32 +11,101 @@ Directory Input Behavior:
 
 Functions:
     compress_css(input_css_file): Compresses and encodes the CSS file
-    process_path(path, recursive): Process either a single file or a directory
+    process_path(path, ...): Process either a single file or a directory
+    find_css_files(root, recursive): Finds CSS files in a directory
     get_input_path(): Gets the CSS file or folder path from user input
     minify_css(css): Minifies CSS content by removing whitespace and comments
+    archive_compress(input_file, archive_type): Archives a single file
+    archive_compress_many(input_files, archive_type, root): Archives many files
+    parse_args(): Parses command-line arguments
 
 Usage:
     Run the script and enter the path to your CSS file or folder when prompted.
     The compressed and encoded output will be saved as 'your_file.css.b64'
+
+    Alternatively pass the options on the command line to run without prompts:
+        python package_css.py styles --recursive --minify --compress brotli
 """
 
+import argparse
 import os
-import glob
-import base64
+import sys
 import re
 import zlib
 import gzip
 import lzma
+import shutil
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 # pylint: disable=import-error
 import brotli  # type: ignore
 import py7zr
 
+try:
+    # SIMD-accelerated drop-in replacement for the stdlib module
+    import pybase64 as base64  # type: ignore
+except ImportError:
+    import base64
+
+# Brotli quality 11 (the default) is many times slower than 5 for a
+# negligible gain on minified CSS; gzip level 6 halves the time of level 9
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+# zlib output is cached as '.b64' and read many times, so favour ratio
+ZLIB_LEVEL = 9
+# Highest level each compression algorithm accepts
+MAX_LEVELS = {"zlib": 9, "gzip": 9, "brotli": 11}
+# xz preset for archives; 6 is the library default, 3 is much faster at a
+# slightly worse ratio
+LZMA_PRESET = 6
+
+# Base name of the combined archive written for directory runs
+ARCHIVE_BUNDLE_NAME = "css_bundle"
+
+# Read size used when streaming files into an archive
+CHUNK_SIZE = 1 << 20
+
+# minify_css makes a single pass with one combined pattern. A "gap" is any
+# run of whitespace and/or comments; the comment pattern is written so it can
+# never extend past the first "*/" when the engine backtracks.
+_COMMENT = r"/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"
+_GAP = rf"(?:(?:{_COMMENT}\s*)+|\s+(?:{_COMMENT}\s*)*)"
+_OPS = r"[{};,:]"
+_RE_COMMENT = re.compile(_COMMENT)
+_RE_MINIFY = re.compile(
+    # Cheap guard so positions that cannot start a match fail immediately
+    r"(?=[\s{};,:]|/\*)(?:"
+    # 1. semicolon (and surrounding gaps) directly before a closing brace
+    rf"{_GAP}?;{_GAP}?(?=\}})"
+    # 2. operator with a gap on either side
+    rf"|{_GAP}(?P<op>{_OPS}){_GAP}?"
+    rf"|(?P<op_after>{_OPS}){_GAP}"
+    # 3. any other gap
+    rf"|(?P<gap>{_GAP})"
+    r")"
+)
+
+
+def _minify_token(match):
+    """Returns the replacement for a single _RE_MINIFY match."""
+    group = match.lastgroup
+    if group is None:
+        return ""
+    if group != "gap":
+        return match.group(group)
+    # Comments vanish; whitespace anywhere in the gap collapses to one space
+    gap = match.group(group)
+    if "/*" in gap:
+        gap = _RE_COMMENT.sub("", gap)
+    return " " if gap else ""
+
 
 def minify_css(css):
     """Minifies CSS content by removing unnecessary characters.
     
-    Performs the following optimizations:
+    Performs the following optimizations in a single scan:
     1. Removes all comments (/* ... */)
     2. Collapses whitespace to single spaces
     3. Removes spaces around CSS operators ({};,:)
@@ -49,45 +118,54 @@ def minify_css(css):
     Returns:
         str: Minified CSS content
     """
-    # Remove comments
-    css = re.sub(r"/\*[\s\S]*?\*/", "", css)
-    # Remove whitespace
-    css = re.sub(r"\s+", " ", css)
-    # Remove spaces around operators
-    css = re.sub(r"\s*([{};,:])\s*", r"\1", css)
-    # Remove unnecessary semicolons
-    css = re.sub(r";}", "}", css)
-    # Remove leading/trailing whitespace
-    css = css.strip()
-    return css
-
-
-def process_css_content(css_content, minify, compress, compress_type):
+    return _RE_MINIFY.sub(_minify_token, css).strip()
+
+
+# Prefer the compiled scanner from _minify.pyx when it has been built;
+# the regex version above is the fallback and reference implementation
+try:
+    from _minify import minify_css  # type: ignore  # noqa: F811
+except ImportError:
+    pass
+
+
+def process_css_content(css_content, minify, compress, compress_type, level=None):
     """Applies minification and compression to CSS based on user preferences.
     
     Args:
-        css_content (str): Original CSS content
+        css_content (bytes): Original UTF-8 encoded CSS content
         minify (bool): Whether to minify the CSS
         compress (bool): Whether to compress the CSS
         compress_type (str): Compression algorithm ('zlib', 'gzip', or 'brotli')
+        level (int): Compression level, or None for the algorithm's default
+            (BROTLI_QUALITY, GZIP_LEVEL or ZLIB_LEVEL)
         
     Returns:
-        bytes: Processed CSS content (compressed if enabled, otherwise just encoded)
+        bytes: Processed CSS content (compressed if enabled, otherwise as read)
     """
     if minify:
-        css_content = minify_css(css_content)
+        # Only the regex pass needs text; encode back to bytes once
+        css_content = minify_css(css_content.decode("utf-8")).encode("utf-8")
     if compress:
         if compress_type == "brotli":
-            return brotli.compress(css_content.encode("utf-8"))
+            return brotli.compress(
+                css_content,
+                mode=brotli.MODE_TEXT,
+                quality=BROTLI_QUALITY if level is None else level,
+            )
         elif compress_type == "gzip":
-            return gzip.compress(css_content.encode("utf-8"))
+            return gzip.compress(
+                css_content, compresslevel=GZIP_LEVEL if level is None else level
+            )
         elif compress_type == "zlib":
-            return zlib.compress(css_content.encode("utf-8"))
-    return css_content.encode("utf-8")
+            return zlib.compress(
+                css_content, level=ZLIB_LEVEL if level is None else level
+            )
+    return css_content
 
 
 def compress_css(
-    input_css_file, minify=True, compress=True, compress_type="brotli"
+    input_css_file, minify=True, compress=True, compress_type="brotli", level=None
 ):
     """Processes, optionally compresses, and Base64 encodes the CSS file.
     
@@ -96,6 +174,7 @@ def compress_css(
         minify (bool): Whether to minify CSS (default: True)
         compress (bool): Whether to compress CSS (default: True)
         compress_type (str): Compression algorithm (default: 'brotli')
+        level (int): Compression level (default: None, algorithm default)
         
     Returns:
         str: Base64-encoded processed CSS content
@@ -103,29 +182,22 @@ def compress_css(
     Output:
         Creates a file with '.b64' extension containing the processed data
     """
-    with open(input_css_file, "r", encoding="utf-8") as f:
+    # Read raw bytes; the file is already UTF-8 so no decode/encode round trip
+    with open(input_css_file, "rb") as f:
         css_content = f.read()
 
-        processed_content = process_css_content(
-            css_content, minify, compress, compress_type
-        )
+    processed_content = process_css_content(
+        css_content, minify, compress, compress_type, level
+    )
 
-        b64_string = (
-            base64.b64encode(processed_content)
-            .decode("utf-8")
-            .replace("\n", "")
-        )
+    # Encode once; encodebytes wraps at 76 characters per line and the
+    # unwrapped string is derived from it rather than encoded again
+    wrapped_b64 = base64.encodebytes(processed_content)
+    b64_string = wrapped_b64.replace(b"\n", b"").decode("ascii")
 
-        output_file = input_css_file + ".b64"
-        line_length = 76
-        formatted_b64 = "\n".join(
-            [
-                b64_string[i : i + line_length]
-                for i in range(0, len(b64_string), line_length)
-            ]
-        )
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(formatted_b64)
+    output_file = input_css_file + ".b64"
+    with open(output_file, "wb") as f:
+        f.write(wrapped_b64)
 
     return b64_string
 
@@ -134,7 +206,8 @@ def get_input_path():
     """Gets user preferences for minification and compression.
     
     Returns:
-        tuple: (user_path, minify, compress, compress_type, archive_type, recursive)
+        tuple: (user_path, minify, compress, compress_type, level, archive_type,
+            recursive)
     """
     user_path = input("Enter the path to your CSS file or folder: ").strip()
     
@@ -172,6 +245,18 @@ def get_input_path():
             print("Invalid compression type. Defaulting to brotli.")
             user_compress_type = "brotli"
 
+    user_level = None
+    if compress:
+        max_level = MAX_LEVELS[user_compress_type]
+        level_choice = input(
+            f"Choose compression level (0-{max_level}, blank for default): "
+        ).strip()
+        if level_choice:
+            if level_choice.isdigit() and int(level_choice) <= max_level:
+                user_level = int(level_choice)
+            else:
+                print("Invalid compression level. Using the default level.")
+
     user_archive_type = None
     if archive:
         user_archive_type = (
@@ -186,11 +271,50 @@ def get_input_path():
             print("Invalid archival type. No archival will be applied.")
             user_archive_type = None
 
-    return user_path, minify, compress, user_compress_type, user_archive_type, recursive
+    return (
+        user_path,
+        minify,
+        compress,
+        user_compress_type,
+        user_level,
+        user_archive_type,
+        recursive,
+    )
+
+
+def find_css_files(root, recursive=True):
+    """Yields the paths of all CSS files in a directory.
+    
+    Walks the tree with os.scandir so the cached directory entry metadata is
+    used instead of extra stat calls. Like glob, hidden entries are skipped.
+    
+    Args:
+        root (str): Directory to search
+        recursive (bool): If True, descend into subdirectories
+        
+    Yields:
+        str: Path of each CSS file found
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    yield from find_css_files(entry.path)
+            elif entry.name.lower().endswith(".css") and entry.is_file():
+                yield entry.path
 
 
 def process_path(
-    input_path, minify, compress, compress_type, archive_type=None, recursive=True
+    input_path,
+    minify,
+    compress,
+    compress_type,
+    archive_type=None,
+    recursive=True,
+    level=None,
+    jobs=None,
 ):
     """Process either a single file or all CSS files in a directory.
     
@@ -201,17 +325,20 @@ def process_path(
         compress_type (str): Compression algorithm to use
         archive_type (str): Archive type (lzma/7z) or None
         recursive (bool): If True, process subdirectories recursively
+        level (int): Compression level, or None for the algorithm's default
+        jobs (int): Number of worker threads, or None for the executor default
         
     Returns:
         str or list: Base64 string(s) of processed CSS
     """
     if os.path.isfile(input_path):
-        if input_path.endswith(".css"):
+        if input_path.lower().endswith(".css"):
             b64_string = compress_css(
                 input_path,
                 minify=minify,
                 compress=compress,
                 compress_type=compress_type,
+                level=level,
             )
             print(f"Processed file: {input_path}")
             if archive_type:
@@ -223,31 +350,36 @@ def process_path(
             return None
 
     elif os.path.isdir(input_path):
-        # Use recursive glob if recursive=True, otherwise only current directory
-        if recursive:
-            css_files = glob.glob(
-                os.path.join(input_path, "**/*.css"), recursive=True
-            )
-        else:
-            css_files = glob.glob(os.path.join(input_path, "*.css"))
+        # Walk subdirectories if recursive=True, otherwise only current directory
+        css_files = list(find_css_files(input_path, recursive))
         
         if not css_files:
             print(f"No CSS files found in {input_path}")
             return None
         
+        # Process the files concurrently on a thread pool
+        process_file = partial(
+            compress_css,
+            minify=minify,
+            compress=compress,
+            compress_type=compress_type,
+            level=level,
+        )
         results = []
-        for css_file in css_files:
-            b64_string = compress_css(
-                css_file,
-                minify=minify,
-                compress=compress,
-                compress_type=compress_type,
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for css_file, b64_string in zip(
+                css_files, executor.map(process_file, css_files)
+            ):
+                print(f"Processed file: {css_file}")
+                results.append(b64_string)
+
+        # Archives are built from the source CSS, not the '.b64' output.
+        # One solid archive lets LZMA reuse redundancy shared between files.
+        if archive_type:
+            archive_file = archive_compress_many(
+                css_files, archive_type, input_path
             )
-            print(f"Processed file: {css_file}")
-            if archive_type:
-                archive_compress(css_file, archive_type)
-                print(f"Archived file: {css_file}")
-            results.append(b64_string)
+            print(f"Archived {len(css_files)} file(s) into: {archive_file}")
         return results
     else:
         print("Invalid path provided")
@@ -257,6 +389,10 @@ def process_path(
 def archive_compress(input_file, archive_type):
     """Compresses a file into an archive using LZMA or 7z.
     
+    Callers pass the original CSS source rather than its '.b64' output:
+    base64 of already-compressed data is close to incompressible, while LZMA
+    does best on the plain text.
+    
     Args:
         input_file (str): Path to the file to archive
         archive_type (str): Archive format ('lzma' or '7z')
@@ -265,26 +401,141 @@ def archive_compress(input_file, archive_type):
         Creates '.xz' file for LZMA or '.7z' file for 7z compression
     """
     if archive_type == "lzma":
-        with lzma.open(input_file + ".xz", "w") as archive:
+        # Stream in fixed-size chunks so memory use is independent of file size
+        with lzma.open(input_file + ".xz", "wb", preset=LZMA_PRESET) as archive:
             with open(input_file, "rb") as f:
-                archive.write(f.read())
+                shutil.copyfileobj(f, archive, length=CHUNK_SIZE)
     elif archive_type == "7z":
         with py7zr.SevenZipFile(input_file + ".7z", "w") as archive:
-            archive.write(input_file, input_file)
+            archive.write(input_file, os.path.basename(input_file))
 
 
-if __name__ == "__main__":
-    # Get user preferences and input path
-    path, minify_opt, compress_opt, compression_type, archival_type, is_recursive = (
-        get_input_path()
-    )
+def archive_compress_many(input_files, archive_type, root):
+    """Compresses several files into a single solid archive using LZMA or 7z.
+    
+    Files are stored under their path relative to root, so files with the
+    same name in different subdirectories do not collide.
     
-    # If user enters ".." or ".", use current directory
-    # ".." triggers recursive mode (all subdirectories)
-    # "." triggers non-recursive mode (current directory only)
-    # Both operate within the current working directory, NOT the parent
-    if path == ".." or path == ".":
-        path = os.path.abspath(".")
+    Args:
+        input_files (list): Paths of the files to archive
+        archive_type (str): Archive format ('lzma' or '7z')
+        root (str): Directory the archive is written to and the base for
+            member names
+        
+    Returns:
+        str: Path of the created archive
+        
+    Output:
+        Creates 'css_bundle.tar.xz' for LZMA or 'css_bundle.7z' for 7z
+        compression inside root
+    """
+    archive_base = os.path.join(root, ARCHIVE_BUNDLE_NAME)
+    if archive_type == "lzma":
+        archive_file = archive_base + ".tar.xz"
+        with tarfile.open(archive_file, "w:xz", preset=LZMA_PRESET) as archive:
+            for input_file in input_files:
+                archive.add(input_file, os.path.relpath(input_file, root))
+    elif archive_type == "7z":
+        archive_file = archive_base + ".7z"
+        with py7zr.SevenZipFile(archive_file, "w") as archive:
+            for input_file in input_files:
+                archive.write(input_file, os.path.relpath(input_file, root))
+    return archive_file
+
+
+def parse_args():
+    """Parses command-line arguments for headless runs.
+    
+    Compression is enabled by choosing an algorithm with --compress and
+    archiving by choosing a format with --archive.
+    
+    Returns:
+        argparse.Namespace: Parsed arguments (path, recursive, minify,
+            compress, level, archive, jobs)
+    """
+    parser = argparse.ArgumentParser(
+        description="Minify, compress and base64-encode CSS files to '.b64' files."
+    )
+    parser.add_argument("path", help="CSS file or directory to process")
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="process subdirectories recursively",
+    )
+    parser.add_argument(
+        "--minify", action="store_true", help="minify the CSS before encoding"
+    )
+    parser.add_argument(
+        "--compress",
+        choices=("zlib", "gzip", "brotli"),
+        default=None,
+        help="compress the CSS with this algorithm",
+    )
+    parser.add_argument(
+        "--level",
+        type=int,
+        default=None,
+        help="compression level (0-9 for zlib/gzip, 0-11 for brotli)",
+    )
+    parser.add_argument(
+        "--archive",
+        choices=("lzma", "7z"),
+        default=None,
+        help="also archive the source CSS in this format",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker threads (default: automatic)",
+    )
+    args = parser.parse_args()
+    if args.level is not None:
+        if args.compress is None:
+            parser.error("--level requires --compress")
+        if not 0 <= args.level <= MAX_LEVELS[args.compress]:
+            parser.error(
+                f"--level for {args.compress} must be between 0 and "
+                f"{MAX_LEVELS[args.compress]}"
+            )
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+
+if __name__ == "__main__":
+    job_count = None
+    if len(sys.argv) > 1:
+        # Headless mode: everything comes from the command line
+        args = parse_args()
+        path = args.path
+        minify_opt = args.minify
+        compress_opt = args.compress is not None
+        compression_type = args.compress or "brotli"
+        compression_level = args.level
+        archival_type = args.archive
+        is_recursive = args.recursive
+        job_count = args.jobs
+    else:
+        # Get user preferences and input path
+        (
+            path,
+            minify_opt,
+            compress_opt,
+            compression_type,
+            compression_level,
+            archival_type,
+            is_recursive,
+        ) = get_input_path()
+        
+        # If user enters ".." or ".", use current directory
+        # ".." triggers recursive mode (all subdirectories)
+        # "." triggers non-recursive mode (current directory only)
+        # Both operate within the current working directory, NOT the parent
+        if path == ".." or path == ".":
+            path = os.path.abspath(".")
     
     process_path(
         path,
@@ -293,6 +544,8 @@ if __name__ == "__main__":
         compress_type=compression_type,
         archive_type=archival_type,
         recursive=is_recursive,
+        level=compression_level,
+        jobs=job_count,
     )
     print(
         "Compression complete! Base64 output '.b64' files have been created."